@@ -6,20 +6,34 @@ Usage:
   python3 four_view.py
 
 This script attempts to use the compiled `rtsp_module.RTSPReader`. If the
-module isn't available it falls back to OpenCV's VideoCapture.
+module isn't available it falls back to OpenCV's VideoCapture. The grid is
+composed by a small C routine compiled for the cell size on first use, or by
+a parallel Numba kernel / NumPy slicing when no C compiler is available.
 
 Controls:
   q - quit
   s - save snapshot of the combined view
 """
 
-import threading
+import ctypes
+import hashlib
+import multiprocessing as mp
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import tempfile
 import time
+from multiprocessing import shared_memory
+from multiprocessing.synchronize import Condition
 from typing import Optional, List
 
 import cv2
 import numpy as np
 
+import snapshot_writer
+
 USE_RTSP_MODULE = False
 try:
     import rtsp_module
@@ -27,64 +41,318 @@ try:
 except Exception:
     USE_RTSP_MODULE = False
 
+USE_NUMBA = False
+try:
+    from numba import njit, prange
+    USE_NUMBA = True
+except Exception:
+    USE_NUMBA = False
+
+# RGA hardware resize is exposed by rtsp_module when it was built against librga
+RGA_RESIZE = getattr(rtsp_module, "rga_resize", None) if USE_RTSP_MODULE else None
+
+# FFmpeg options for the VideoCapture fallback: decode on the VPU via rkmpp.
+# Only used if the user has not set OPENCV_FFMPEG_CAPTURE_OPTIONS already; if
+# the capture does not open with them it is reopened with software decoding.
+FFMPEG_CAPTURE_OPTIONS = (
+    "rtsp_transport;tcp|hwaccel;drm|hwaccel_device;/dev/dri/renderD128|video_codec;h264_rkmpp"
+)
+
+# VideoCapture fallback: a live grab() blocks for most of a frame period
+# waiting on the camera, while one served from the capture's internal buffer
+# costs only its decode. A grab() quicker than STALE_GRAB_FRACTION of the
+# stream's frame period is therefore treated as stale; up to MAX_STALE_GRABS
+# such frames are skipped per read. DEFAULT_STREAM_FPS is used when the
+# stream does not report a usable rate.
+STALE_GRAB_FRACTION = 0.25
+MAX_STALE_GRABS = 3
+DEFAULT_STREAM_FPS = 25.0
+
+# Frame slots in each reader's shared-memory ring. The consumer always takes the
+# newest slot, which is only rewritten after FRAME_SLOTS - 1 further frames.
+FRAME_SLOTS = 3
+
+# Longest the display loop waits for a new frame before servicing the GUI anyway
+FRAME_WAIT_TIMEOUT = 0.1
+
+# Grid refresh rate; readers keep running at the cameras' native rate
+DISPLAY_FPS = 30
+
+
+# Source size opencl_resize_is_faster() assumes when the stream's is not known yet
+OPENCL_BENCHMARK_SRC_SIZE = (1920, 1080)
+
+
+def opencl_resize_is_faster(size, src_size=OPENCL_BENCHMARK_SRC_SIZE, iterations=10) -> bool:
+    """Benchmark cv2.resize through the OpenCL T-API against the CPU.
+
+    OpenCL resize can be slower than the CPU on some GPUs/drivers, so it is only
+    used when it wins on this machine. Both sides are timed the way
+    CameraReader runs them: the OpenCL side includes the upload, the download
+    with get() and the copy into the destination slot. Run it once, with
+    nothing else competing for the GPU/CPU, and hand the result to the readers.
+    """
+    if not cv2.ocl.haveOpenCL():
+        return False
+    cv2.ocl.setUseOpenCL(True)
+    src = np.zeros((src_size[1], src_size[0], 3), dtype=np.uint8)
+    dst = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    try:
+        u_dst = cv2.UMat(size[1], size[0], cv2.CV_8UC3)
+
+        def ocl_resize():
+            cv2.resize(cv2.UMat(src), size, dst=u_dst)
+            np.copyto(dst, u_dst.get())
+
+        ocl_resize()  # warm-up: kernel compilation
+        start = time.perf_counter()
+        for _ in range(iterations):
+            ocl_resize()
+        ocl_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            cv2.resize(src, size, dst=dst)
+        cpu_time = time.perf_counter() - start
+        faster = ocl_time < cpu_time
+    except cv2.error as e:
+        print(f"OpenCL resize unavailable: {e}")
+        faster = False
+    print(f"OpenCL resize {'enabled' if faster else 'disabled'} for "
+          f"{src_size[0]}x{src_size[1]} -> {size[0]}x{size[1]}")
+    return faster
 
-class CameraReader(threading.Thread):
-    def __init__(self, src: str, idx: int, resize_to=(640, 360)):
+
+class CameraReader(mp.Process):
+    """Reads one camera in its own process, escaping the GIL of the viewer.
+
+    Frames are exchanged through a shared-memory ring, so the viewer process
+    maps the same slots and reads them without any IPC copy.
+    """
+
+    def __init__(self, src: str, idx: int, resize_to=(640, 360),
+                 frame_ready: Optional[Condition] = None, use_opencl: bool = False):
         super().__init__(daemon=True)
         self.src = src
         self.idx = idx
         self.resize_to = resize_to
-        self.lock = threading.Lock()
-        self.frame: Optional[np.ndarray] = None
-        self.running = True
+        # Notified after each new frame; may be shared between readers so a
+        # single consumer can wait on all of them
+        self.frame_ready = frame_ready if frame_ready is not None else mp.Condition()
+        self.running = mp.Event()
+        self.running.set()
+        # False while the stream is failing; the viewer blanks the cell
+        self._connected = mp.Value('b', False, lock=False)
 
         self._use_module = USE_RTSP_MODULE
+        self._use_rga = False
+        # Result of opencl_resize_is_faster(), measured once by the parent
+        self._opencl_faster = use_opencl
+        self._use_ocl = False
+        self._ocl_dst = None  # persistent OpenCL resize target, made on first use
         self._vc = None
         self._reader = None
+        # Grabs quicker than this are stale; set from the stream's fps on open
+        self._stale_grab_s = STALE_GRAB_FRACTION / DEFAULT_STREAM_FPS
+        # Source (width, height), learned from the first fallback frame
+        self._src_size = None
+        self._needs_resize = False
+        # Ring of preallocated frame slots in shared memory. The reader writes
+        # each frame straight into the next slot and then bumps _write_idx
+        # (under its lock); the consumer only ever gets an index into the ring,
+        # so nothing is allocated or copied per frame in steady state.
+        w, h = resize_to
+        self._slot_bytes = w * h * 3
+        self._shm = shared_memory.SharedMemory(create=True, size=self._slot_bytes * FRAME_SLOTS)
+        self._slots: Optional[List[np.ndarray]] = None  # mapped lazily in each process
+        self._write_idx = mp.Value('L', 0)  # frames published; newest is slots[(idx - 1) % FRAME_SLOTS]
+        self._read_idx = 0                   # _write_idx as of the consumer's last take_frame()
+
+    def __getstate__(self):
+        # Slot views are per-process mappings; the child rebuilds its own
+        state = self.__dict__.copy()
+        state["_slots"] = None
+        return state
+
+    @property
+    def connected(self) -> bool:
+        return bool(self._connected.value)
+
+    @property
+    def slots(self) -> List[np.ndarray]:
+        if self._slots is None:
+            w, h = self.resize_to
+            self._slots = [
+                np.ndarray((h, w, 3), dtype=np.uint8, buffer=self._shm.buf,
+                           offset=i * self._slot_bytes)
+                for i in range(FRAME_SLOTS)
+            ]
+        return self._slots
 
     def open(self):
         if self._use_module:
             try:
-                self._reader = rtsp_module.RTSPReader(self.src)
+                # The module decodes and scales to the cell size itself
+                # (rkmpp + RGA), so its frames need no Python-side processing
+                self._reader = rtsp_module.RTSPReader(
+                    self.src, width=self.resize_to[0], height=self.resize_to[1]
+                )
             except Exception as e:
                 print(f"Camera[{self.idx}] rtsp_module failed to open: {e}")
                 self._reader = None
         if not self._use_module or self._reader is None:
             # Fallback to OpenCV VideoCapture
-            self._vc = cv2.VideoCapture(self.src)
+            self._vc = self._open_capture()
+            # Keep as few frames queued as the backend allows
+            self._vc.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            fps = self._vc.get(cv2.CAP_PROP_FPS)
+            if not 1.0 <= fps <= 240.0:
+                # 0 (unknown) or a bogus timebase-derived value
+                fps = DEFAULT_STREAM_FPS
+            self._stale_grab_s = STALE_GRAB_FRACTION / fps
+            self._use_rga = RGA_RESIZE is not None
+            if not self._use_rga:
+                self._use_ocl = self._opencl_faster
+                if self._use_ocl:
+                    cv2.ocl.setUseOpenCL(True)
+
+    def _open_capture(self) -> cv2.VideoCapture:
+        # OpenCV only reads FFmpeg capture options from the environment, so set
+        # them just for this open (each reader is its own process) and leave
+        # any options the user exported untouched
+        scoped = "OPENCV_FFMPEG_CAPTURE_OPTIONS" not in os.environ
+        if scoped:
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = FFMPEG_CAPTURE_OPTIONS
+        try:
+            try:
+                # Hardware acceleration must be requested at open time. No
+                # CAP_PROP_HW_DEVICE: OpenCV rejects a device index with 'ANY'
+                vc = cv2.VideoCapture(self.src, cv2.CAP_FFMPEG, [
+                    cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                ])
+            except (AttributeError, TypeError, cv2.error):
+                # OpenCV < 4.5.2 has no open-time parameters
+                vc = cv2.VideoCapture(self.src, cv2.CAP_FFMPEG)
+        finally:
+            if scoped:
+                del os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"]
+        if vc.isOpened():
+            if scoped:
+                print(f"Camera[{self.idx}] VideoCapture opened with rkmpp hardware decoding")
+            else:
+                print(f"Camera[{self.idx}] VideoCapture opened with the exported OPENCV_FFMPEG_CAPTURE_OPTIONS")
+            return vc
+
+        # Typically a stock OpenCV whose FFmpeg lacks h264_rkmpp, or an HEVC stream
+        vc.release()
+        if scoped:
+            print(f"Camera[{self.idx}] rkmpp VideoCapture failed to open, retrying with software decoding")
+        else:
+            print(f"Camera[{self.idx}] VideoCapture failed to open, retrying without hardware acceleration")
+        vc = cv2.VideoCapture(self.src, cv2.CAP_FFMPEG)
+        if vc.isOpened():
+            print(f"Camera[{self.idx}] VideoCapture opened without hardware acceleration")
+        else:
+            print(f"Camera[{self.idx}] VideoCapture failed to open: {self.src}")
+        return vc
+
+    def _grab_latest(self):
+        # Skip frames that piled up while we were busy so the one retrieved is at HEAD
+        start = time.perf_counter()
+        ok = self._vc.grab()
+        skipped = 0
+        while ok and skipped < MAX_STALE_GRABS and time.perf_counter() - start < self._stale_grab_s:
+            start = time.perf_counter()
+            ok = self._vc.grab()
+            skipped += 1
+        if not ok:
+            return False, None
+        return self._vc.retrieve()
+
+    def _next_slot(self) -> np.ndarray:
+        # Slot the next frame is written into; not visible to the consumer yet
+        return self.slots[self._write_idx.value % FRAME_SLOTS]
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        # Resize into the next ring slot
+        w, h = self.resize_to
+        dst = self._next_slot()
+        if self._use_rga:
+            try:
+                ok = RGA_RESIZE(np.ascontiguousarray(frame), dst)
+            except Exception as e:
+                print(f"Camera[{self.idx}] RGA resize error: {e}")
+                ok = False
+            if ok:
+                return dst
+            print(f"Camera[{self.idx}] RGA resize failed, falling back to cv2.resize")
+            self._use_rga = False
+        if self._use_ocl:
+            # OpenCL (Mali GPU) path. The device-side result is reused; get()
+            # can only download into a new array, which is copied into the slot
+            if self._ocl_dst is None:
+                self._ocl_dst = cv2.UMat(h, w, cv2.CV_8UC3)
+            cv2.resize(cv2.UMat(frame), (w, h), dst=self._ocl_dst)
+            np.copyto(dst, self._ocl_dst.get())
+            return dst
+        return cv2.resize(frame, (w, h), dst=dst)
+
+    def _process(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        # Resize and ensure BGR 3-channel (VideoCapture frames arrive at source size)
+        try:
+            if self._src_size is None:
+                # Cameras don't change resolution mid-stream, so decide once
+                self._src_size = (frame.shape[1], frame.shape[0])
+                self._needs_resize = self._src_size != (self.resize_to[0], self.resize_to[1])
+                if self._use_ocl and self._needs_resize and self._src_size != OPENCL_BENCHMARK_SRC_SIZE:
+                    # The parent benchmarked a 1080p source; recheck at this stream's size
+                    self._use_ocl = opencl_resize_is_faster(tuple(self.resize_to), self._src_size)
+            if frame.ndim == 2:
+                # Shrink while still single-channel, then expand to BGR straight
+                # into the ring slot: the full-size frame is read once and no
+                # full-size BGR intermediate is written
+                if self._needs_resize:
+                    frame = cv2.resize(frame, (self.resize_to[0], self.resize_to[1]))
+                return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR, dst=self._next_slot())
+            if self._needs_resize:
+                frame = self._resize(frame)
+            return frame
+        except Exception as e:
+            print(f"Camera[{self.idx}] processing error: {e}")
+            return None
 
     def run(self):
+        # Ctrl+C reaches the whole process group; the parent stops us through
+        # `running` (or terminate()) so the cleanup below still runs
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
         self.open()
-        while self.running:
+        while self.running.is_set():
             frame = None
             try:
                 if self._reader is not None:
-                    mat = self._reader.read()
-                    frame = np.array(mat, copy=False)
+                    # Decode straight into the ring slot
+                    frame = self._next_slot()
+                    self._reader.read_into(frame)
                 elif self._vc is not None:
-                    ret, f = self._vc.read()
+                    ret, f = self._grab_latest()
                     if not ret:
                         frame = None
                     else:
-                        frame = f
+                        frame = self._process(f)
+                if frame is not None:
+                    slot = self._next_slot()
+                    if frame is not slot:
+                        np.copyto(slot, frame)
             except Exception as e:
                 print(f"Camera[{self.idx}] read error: {e}")
                 frame = None
 
             if frame is not None:
-                # Resize and ensure BGR 3-channel
-                try:
-                    h, w = frame.shape[:2]
-                    if frame.ndim == 2:
-                        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-                    if (w, h) != (self.resize_to[0], self.resize_to[1]):
-                        frame = cv2.resize(frame, (self.resize_to[0], self.resize_to[1]))
-                except Exception as e:
-                    print(f"Camera[{self.idx}] processing error: {e}")
-                    frame = None
-
-            with self.lock:
-                self.frame = frame
+                with self._write_idx.get_lock():
+                    self._write_idx.value += 1
+                with self.frame_ready:
+                    self.frame_ready.notify_all()
+            self._connected.value = frame is not None
 
             if frame is None:
                 # Wait a bit before retrying on failure
@@ -102,26 +370,187 @@ class CameraReader(threading.Thread):
             except Exception:
                 pass
 
+    def has_frame(self) -> bool:
+        return self._write_idx.value != self._read_idx
+
+    def take_frame(self) -> Optional[np.ndarray]:
+        """Return the newest frame's slot, or None if none arrived since the last call.
+
+        The slot is a view into the ring, not a copy: it stays valid until
+        FRAME_SLOTS - 1 more frames are published, so use it (or take a newer
+        one) promptly.
+        """
+        idx = self._write_idx.value
+        if idx == self._read_idx:
+            return None
+        self._read_idx = idx
+        return self.slots[(idx - 1) % FRAME_SLOTS]
+
     def stop(self):
-        self.running = False
+        self.running.clear()
+
+    def close(self):
+        # Free the frame ring once the process has exited and slots are unused
+        self._slots = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A caller still holds a slot view; the mapping goes with it
+            pass
+        self._shm.unlink()
+        super().close()
+
+
+# C source for the fixed 2x2 layout; the cell size is baked in so the row
+# copies have constant trip counts and strides the compiler can vectorize
+_COMPOSE_2X2_SRC = r"""
+#include <stdint.h>
+
+#define CELL_W %(w)d
+#define CELL_H %(h)d
+#define ROW_BYTES (CELL_W * 3)
+#define DST_STRIDE (2 * ROW_BYTES)
+
+void compose_2x2(uint8_t *restrict dst,
+                 const uint8_t *restrict c0, const uint8_t *restrict c1,
+                 const uint8_t *restrict c2, const uint8_t *restrict c3)
+{
+    const uint8_t *cells[4] = { c0, c1, c2, c3 };
+    for (int q = 0; q < 4; q++) {
+        const uint8_t *src = cells[q];
+        if (!src)
+            continue;  /* missing cell: leave the quadrant untouched */
+        uint8_t *out = dst + (q >> 1) * CELL_H * DST_STRIDE + (q & 1) * ROW_BYTES;
+#pragma GCC ivdep
+        for (int y = 0; y < CELL_H; y++)
+            __builtin_memcpy(out + y * DST_STRIDE, src + y * ROW_BYTES, ROW_BYTES);
+    }
+}
+"""
+
+_COMPOSE_2X2_CFLAGS = ["-O3", "-std=c99", "-shared", "-fPIC"]
+_COMPOSE_2X2_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "four_view")
+
+# compose_2x2 function per cell size; None if it could not be built
+_compose_2x2_funcs = {}
+
+
+def _compose_2x2_for(per):
+    """Compile (or load the cached build of) compose_2x2 for a (width, height) cell.
+
+    Call this before the display loop: a cold build runs the C compiler.
+    """
+    if per in _compose_2x2_funcs:
+        return _compose_2x2_funcs[per]
+
+    func = None
+    cc = os.environ.get("CC", "cc")
+    src = _COMPOSE_2X2_SRC % {"w": per[0], "h": per[1]}
+    # Key the cache on everything that affects the binary, so a shared
+    # ~/.cache never serves a build from another compiler or architecture
+    key = "\0".join([src, cc, shutil.which(cc) or "", " ".join(_COMPOSE_2X2_CFLAGS),
+                      platform.machine()])
+    tag = hashlib.sha1(key.encode()).hexdigest()[:12]
+    lib_path = os.path.join(_COMPOSE_2X2_CACHE_DIR, f"compose_2x2_{per[0]}x{per[1]}_{tag}.so")
+    try:
+        if not os.path.exists(lib_path):
+            print(f"Building compose_2x2 for {per[0]}x{per[1]} cells...")
+            os.makedirs(_COMPOSE_2X2_CACHE_DIR, exist_ok=True)
+            with tempfile.TemporaryDirectory() as tmp:
+                c_path = os.path.join(tmp, "compose_2x2.c")
+                tmp_lib = os.path.join(tmp, "compose_2x2.so")
+                with open(c_path, "w") as f:
+                    f.write(src)
+                subprocess.run(
+                    [cc, *_COMPOSE_2X2_CFLAGS, c_path, "-o", tmp_lib],
+                    check=True, capture_output=True, timeout=60,
+                )
+                os.replace(tmp_lib, lib_path)
+        lib = ctypes.CDLL(lib_path)
+        func = lib.compose_2x2
+        func.argtypes = [ctypes.c_void_p] * 5
+        func.restype = None
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"compose_2x2 unavailable for {per[0]}x{per[1]}, using fallback: {e}")
+        func = None
+
+    _compose_2x2_funcs[per] = func
+    return func
+
 
+def _cell_ptr(f: Optional[np.ndarray], shape) -> Optional[int]:
+    # Data pointer for compose_2x2, or None for a missing cell
+    if f is None:
+        return None
+    if f.shape != shape or f.dtype != np.uint8 or not f.flags.c_contiguous:
+        raise ValueError("cell layout does not match compose_2x2")
+    return f.__array_interface__["data"][0]
 
-def compose_grid(frames: List[Optional[np.ndarray]], per=(640, 360)) -> np.ndarray:
+
+if USE_NUMBA:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _fill_grid(canvas, c0, c1, c2, c3, valid):
+        # Rows are split across cores; invalid cells are left untouched
+        h = canvas.shape[0] // 2
+        w = canvas.shape[1] // 2
+        for row in prange(h):
+            if valid[0]:
+                canvas[row, :w] = c0[row]
+            if valid[1]:
+                canvas[row, w:] = c1[row]
+            if valid[2]:
+                canvas[h + row, :w] = c2[row]
+            if valid[3]:
+                canvas[h + row, w:] = c3[row]
+
+
+def _quadrant(canvas: np.ndarray, idx: int, per=(640, 360)) -> np.ndarray:
+    w, h = per
+    row, col = divmod(idx, 2)
+    return canvas[row * h:(row + 1) * h, col * w:(col + 1) * w]
+
+
+def clear_cell(canvas: np.ndarray, idx: int, per=(640, 360)):
+    # Blank one quadrant, e.g. once when its camera drops out
+    _quadrant(canvas, idx, per).fill(0)
+
+
+def compose_grid(frames: List[Optional[np.ndarray]], per=(640, 360),
+                 canvas: Optional[np.ndarray] = None) -> np.ndarray:
     # frames: list of 4 frames or None
     # per: (width, height) per cell
+    # canvas: optional preallocated (2h, 2w, 3) uint8 output, reused across calls.
+    #   Quadrants of None frames are left untouched, so start from a zeroed
+    #   canvas and use clear_cell() when a camera drops out.
     w, h = per
-    blank = np.zeros((h, w, 3), dtype=np.uint8)
-    cells = []
-    for f in frames:
-        if f is None:
-            cells.append(blank.copy())
-        else:
-            cells.append(f)
+    if canvas is None:
+        canvas = np.zeros((2 * h, 2 * w, 3), dtype=np.uint8)
 
-    top = np.hstack((cells[0], cells[1]))
-    bottom = np.hstack((cells[2], cells[3]))
-    grid = np.vstack((top, bottom))
-    return grid
+    compose_2x2 = _compose_2x2_for((w, h))
+    if compose_2x2 is not None and canvas.flags.c_contiguous and canvas.shape == (2 * h, 2 * w, 3):
+        shape = (h, w, 3)
+        try:
+            ptrs = [_cell_ptr(f, shape) for f in frames]
+        except ValueError:
+            ptrs = None
+        if ptrs is not None:
+            compose_2x2(canvas.__array_interface__["data"][0], *ptrs)
+            return canvas
+
+    if USE_NUMBA:
+        # Missing cells are passed as the canvas itself (never read) so every
+        # call hits the same compiled specialization
+        cells = [canvas if f is None else f for f in frames]
+        valid = (frames[0] is not None, frames[1] is not None,
+                 frames[2] is not None, frames[3] is not None)
+        _fill_grid(canvas, cells[0], cells[1], cells[2], cells[3], valid)
+        return canvas
+
+    # Copy each cell straight into its quadrant
+    for idx, f in enumerate(frames):
+        if f is not None:
+            _quadrant(canvas, idx, per)[...] = f
+    return canvas
 
 
 def main():
@@ -141,38 +570,90 @@ def main():
         urls.append(u if u else defaults[i])
 
     per_cell = (640, 360)
-    readers = [CameraReader(urls[i], i, resize_to=per_cell) for i in range(4)]
+    # Build (or load) the grid routine up front rather than stalling the first frame
+    _compose_2x2_for(per_cell)
+
+    frame_ready = mp.Condition()
+    use_opencl = False
+    if RGA_RESIZE is None:
+        # Benchmark once, before the readers compete for the GPU. It runs in a
+        # spawned helper so no OpenCL context exists in this process when the
+        # readers are forked.
+        with mp.get_context("spawn").Pool(1) as pool:
+            use_opencl = pool.apply(opencl_resize_is_faster, (per_cell,))
+    readers = [CameraReader(urls[i], i, resize_to=per_cell, frame_ready=frame_ready,
+                            use_opencl=use_opencl)
+               for i in range(4)]
     for r in readers:
         r.start()
 
     cv2.namedWindow("4-View", cv2.WINDOW_NORMAL | cv2.WINDOW_KEEPRATIO)
     cv2.resizeWindow("4-View", per_cell[0] * 2, per_cell[1] * 2)
+    # Zeroed once; empty cells stay black without per-frame blanking
+    canvas = np.zeros((per_cell[1] * 2, per_cell[0] * 2, 3), dtype=np.uint8)
+
+    # Last frame claimed from each reader; kept until a newer one arrives
+    frames: List[Optional[np.ndarray]] = [None] * len(readers)
+    dead = [False] * len(readers)
+    grid = canvas
+    show_interval = 1.0 / DISPLAY_FPS
+    last_show = 0.0
 
     try:
         while True:
-            frames = []
-            for r in readers:
-                with r.lock:
-                    frames.append(r.frame.copy() if r.frame is not None else None)
+            # Compose and show at most DISPLAY_FPS times per second; in between
+            # only service the GUI so key presses stay responsive
+            if time.monotonic() - last_show >= show_interval:
+                # Sleep until any reader has a new frame (bounded so the GUI stays live)
+                with frame_ready:
+                    frame_ready.wait_for(lambda: any(r.has_frame() for r in readers),
+                                         timeout=FRAME_WAIT_TIMEOUT)
+
+                for i, r in enumerate(readers):
+                    f = r.take_frame()
+                    if f is not None:
+                        frames[i] = f
+                        continue
+                    # A reader that crashed never clears its connected flag
+                    alive = r.is_alive()
+                    if not alive and not dead[i]:
+                        dead[i] = True
+                        print(f"Camera[{i}] reader process exited (exit code {r.exitcode})")
+                    if (not alive or not r.connected) and frames[i] is not None:
+                        frames[i] = None
+                        clear_cell(canvas, i, per=per_cell)
+
+                grid = compose_grid(frames, per=per_cell, canvas=canvas)
+                cv2.imshow("4-View", grid)
+                last_show = time.monotonic()
 
-            grid = compose_grid(frames, per=per_cell)
-            cv2.imshow("4-View", grid)
             key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 break
             elif key == ord('s'):
                 ts = int(time.time())
                 fn = f"4view_snapshot_{ts}.jpg"
-                cv2.imwrite(fn, grid)
-                print(f"Saved snapshot: {fn}")
-            time.sleep(0.01)
+                # Queues a private copy, so the reused canvas is safe to overwrite
+                snapshot_writer.save_async(grid, fn)
     except KeyboardInterrupt:
         pass
     finally:
+        # Let queued snapshots finish writing
+        snapshot_writer.flush()
         for r in readers:
             r.stop()
-        # Give threads a moment to exit
-        time.sleep(0.2)
+        # Give readers a moment to exit; one blocked in a stream read is killed
+        for r in readers:
+            r.join(timeout=0.2)
+            if r.is_alive():
+                r.terminate()
+                r.join()
+        # Drop every slot view first so close() can unmap the rings
+        # (f may never have been bound if we were interrupted early)
+        frames = []
+        f = None
+        for r in readers:
+            r.close()
         cv2.destroyAllWindows()
 
 
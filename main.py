@@ -6,6 +6,8 @@ import numpy as np
 import time
 from typing import Optional
 
+import snapshot_writer
+
 try:
     import rtsp_module
 except ImportError:
@@ -60,13 +62,8 @@ class RTSPStreamHandler:
             return None
             
         try:
-            # Read frame using the C++ module
-            cv_mat = self.reader.read()
-            
-            # Convert cv::Mat to NumPy array
-            # The C++ module should handle this conversion automatically
-            # through the buffer protocol
-            frame = np.array(cv_mat, copy=False)
+            # Read frame using the C++ module (returned as a NumPy array)
+            frame = self.reader.read()
             
             return frame
         except Exception as e:
@@ -104,29 +101,20 @@ def display_stream_info(frame: np.ndarray):
 
 def save_frame(frame: np.ndarray, filename: str) -> bool:
     """
-    Save a frame to disk.
+    Save a frame to disk in the background.
+    
+    The frame is copied and written by the snapshot writer thread, so the
+    caller may reuse it immediately. Call snapshot_writer.flush() before
+    exiting to wait for pending writes.
     
     Args:
-        frame (np.ndarray): The frame to save
+        frame (np.ndarray): The frame to save (BGR, as it comes from the module)
         filename (str): Output filename
         
     Returns:
-        bool: True if saved successfully, False otherwise
+        bool: True if queued, False if the save queue is full
     """
-    try:
-        # OpenCV imwrite expects BGR ordering for color images
-        # The frames coming from the module are BGR; write them directly.
-        success = cv2.imwrite(filename, frame)
-        
-        if success:
-            print(f"Frame saved as: {filename}")
-        else:
-            print(f"Failed to save frame as: {filename}")
-        
-        return success
-    except Exception as e:
-        print(f"Error saving frame: {e}")
-        return False
+    return snapshot_writer.save_async(frame, filename)
 
 
 def main():
@@ -214,6 +202,7 @@ def main():
     
     finally:
         # Clean up
+        snapshot_writer.flush()
         stream_handler.disconnect()
         cv2.destroyAllWindows()
         print("Cleanup completed.")
@@ -237,8 +226,7 @@ def test_simple_capture():
         
         for i in range(5):
             print(f"Capturing frame {i+1}/5...")
-            frame_mat = reader.read()
-            frame = np.array(frame_mat, copy=False)
+            frame = reader.read()
             
             print(f"Frame shape: {frame.shape}, dtype: {frame.dtype}")
             
@@ -2,6 +2,7 @@
 #include <pybind11/numpy.h>  // For NumPy support
 #include <opencv2/core.hpp>
 #include <opencv2/imgproc.hpp>  // For color conversions
+#include <climits>  // For INT_MAX
 #include <stdexcept>  // For error handling
 #include <iostream>
 
@@ -23,8 +24,25 @@ namespace py = pybind11;
 // RTSPReader using jellyfin-ffmpeg with rkmpp hardware decoding and RGA conversion
 class RTSPReader {
 public:
-    RTSPReader(const std::string& url) : fmt_ctx(nullptr), codec_ctx(nullptr), hw_device_ctx(nullptr), 
-                                          sws_ctx(nullptr), video_stream_index(-1), use_rga(true) {
+    // width/height select the output size (0 keeps the stream's native size);
+    // pix_fmt selects the output channel order ("bgr24" or "rgb24").
+    RTSPReader(const std::string& url, int width = 0, int height = 0, const std::string& pix_fmt = "bgr24")
+        : fmt_ctx(nullptr), codec_ctx(nullptr), hw_device_ctx(nullptr),
+          sws_ctx(nullptr), video_stream_index(-1), use_rga(true),
+          rga_layout_warned(false), out_width(width), out_height(height) {
+        if (width < 0 || height < 0) {
+            throw std::invalid_argument("width and height must be >= 0");
+        }
+        if (pix_fmt == "bgr24") {
+            out_av_format = AV_PIX_FMT_BGR24;
+            out_rga_format = RK_FORMAT_BGR_888;
+        } else if (pix_fmt == "rgb24") {
+            out_av_format = AV_PIX_FMT_RGB24;
+            out_rga_format = RK_FORMAT_RGB_888;
+        } else {
+            throw std::invalid_argument("Unsupported pix_fmt: " + pix_fmt + " (expected bgr24 or rgb24)");
+        }
+
         avformat_network_init();
         
         // Open RTSP stream with minimal buffering (1 frame)
@@ -136,7 +154,43 @@ public:
         cleanup();
     }
 
-    cv::Mat read() {
+    // Decode the next frame into a new NumPy array (owns its data, no copy)
+    py::array_t<uint8_t> read() {
+        cv::Mat* mat = new cv::Mat();
+        try {
+            py::gil_scoped_release release;
+            decode_into(*mat);
+        } catch (...) {
+            delete mat;
+            throw;
+        }
+        py::capsule owner(mat, [](void* p) { delete reinterpret_cast<cv::Mat*>(p); });
+        return py::array_t<uint8_t>(
+            { mat->rows, mat->cols, 3 },
+            { static_cast<ssize_t>(mat->step[0]), static_cast<ssize_t>(3), static_cast<ssize_t>(1) },
+            mat->data, owner);
+    }
+
+    // Decode the next frame straight into a caller-owned HxWx3 uint8 array,
+    // which must match the output size
+    void read_into(py::array_t<uint8_t> buf) {
+        if (buf.ndim() != 3 || buf.shape(2) != 3 || !(buf.flags() & py::array::c_style)) {
+            throw std::runtime_error("read_into expects a C-contiguous HxWx3 uint8 array");
+        }
+        cv::Mat out_mat(static_cast<int>(buf.shape(0)), static_cast<int>(buf.shape(1)), CV_8UC3,
+                        buf.mutable_data());
+        py::gil_scoped_release release;
+        decode_into(out_mat);
+    }
+
+    void release() {
+        // Destructor handles cleanup
+    }
+
+private:
+    // Decode the next video frame into out_mat. An empty out_mat is allocated
+    // at the output size; a preallocated one is written in place.
+    void decode_into(cv::Mat& out_mat) {
         int ret = 0;
         while ((ret = av_read_frame(fmt_ctx, pkt)) >= 0) {
             if (pkt->stream_index == video_stream_index) {
@@ -167,17 +221,31 @@ public:
                     src_frame = hw_frame;
                 }
 
-                // Convert to BGR
+                // Convert to BGR (or RGB), scaling to the requested size in the same pass
                 int width = src_frame->width;
                 int height = src_frame->height;
                 int src_format = src_frame->format;
+                int dst_width = out_width > 0 ? out_width : width;
+                int dst_height = out_height > 0 ? out_height : height;
                 
-                cv::Mat out_mat(height, width, CV_8UC3);
+                if (out_mat.empty()) {
+                    out_mat.create(dst_height, dst_width, CV_8UC3);
+                } else if (out_mat.rows != dst_height || out_mat.cols != dst_width) {
+                    throw std::runtime_error(
+                        "Output buffer is " + std::to_string(out_mat.cols) + "x" + std::to_string(out_mat.rows) +
+                        " but frames are " + std::to_string(dst_width) + "x" + std::to_string(dst_height));
+                }
                 
-                // Try RGA conversion if available (much faster on RK3588)
-                if (use_rga && src_format == AV_PIX_FMT_NV12) {
-                    if (convert_with_rga(src_frame, out_mat)) {
-                        return out_mat;
+                // Try RGA conversion if available (much faster on RK3588); an
+                // NV12 layout RGA cannot describe goes through swscale instead
+                int nv12_hstride = src_format == AV_PIX_FMT_NV12 ? rga_nv12_hstride(src_frame) : 0;
+                if (use_rga && src_format == AV_PIX_FMT_NV12 && nv12_hstride == 0 && !rga_layout_warned) {
+                    std::cerr << "NV12 planes are not contiguous, converting with swscale" << std::endl;
+                    rga_layout_warned = true;
+                }
+                if (use_rga && nv12_hstride > 0) {
+                    if (convert_with_rga(src_frame, nv12_hstride, out_mat)) {
+                        return;
                     } else {
                         std::cerr << "RGA conversion failed, falling back to swscale" << std::endl;
                         use_rga = false;
@@ -187,7 +255,7 @@ public:
                 // Fallback to software swscale conversion
                 SwsContext* local_sws = sws_getContext(
                     width, height, (AVPixelFormat)src_format,
-                    width, height, AV_PIX_FMT_BGR24,
+                    dst_width, dst_height, out_av_format,
                     SWS_BILINEAR, nullptr, nullptr, nullptr
                 );
                 
@@ -201,7 +269,7 @@ public:
                 sws_scale(local_sws, src_frame->data, src_frame->linesize, 0, height, dest, dest_linesize);
                 sws_freeContext(local_sws);
 
-                return out_mat;
+                return;
             }
             av_packet_unref(pkt);
         }
@@ -209,11 +277,6 @@ public:
         throw std::runtime_error("Failed to read frame from RTSP stream (EOF or error)");
     }
 
-    void release() {
-        // Destructor handles cleanup
-    }
-
-private:
     AVFormatContext* fmt_ctx;
     AVCodecContext* codec_ctx;
     AVBufferRef* hw_device_ctx;
@@ -223,30 +286,60 @@ private:
     SwsContext* sws_ctx;
     int video_stream_index;
     bool use_rga;
+    bool rga_layout_warned;
+    int out_width;
+    int out_height;
+    AVPixelFormat out_av_format;
+    int out_rga_format;
     
-    bool convert_with_rga(AVFrame* src_frame, cv::Mat& dst) {
-        // RGA conversion from NV12 to BGR using im2d API
+    // RGA takes NV12 as one buffer whose UV plane starts hstride rows after Y.
+    // Frames from av_hwframe_transfer_data are allocated by av_frame_get_buffer,
+    // which pads rows and planes, so derive hstride from where data[1] really
+    // is. Returns 0 if the planes cannot be described that way.
+    static int rga_nv12_hstride(const AVFrame* f) {
+        int linesize = f->linesize[0];
+        ptrdiff_t uv_offset = f->data[1] - f->data[0];
+        if (linesize <= 0 || f->linesize[1] != linesize || uv_offset <= 0 || uv_offset % linesize != 0) {
+            return 0;
+        }
+        ptrdiff_t hstride = uv_offset / linesize;
+        if (hstride < f->height || hstride > INT_MAX) {
+            return 0;
+        }
+        return static_cast<int>(hstride);
+    }
+
+    bool convert_with_rga(AVFrame* src_frame, int hstride, cv::Mat& dst) {
+        // RGA conversion from NV12 to BGR/RGB using im2d API. RGA scales and
+        // converts in a single blit when the destination size differs.
         rga_buffer_t src_buf, dst_buf;
         memset(&src_buf, 0, sizeof(src_buf));
         memset(&dst_buf, 0, sizeof(dst_buf));
         
-        // Setup source buffer (NV12)
+        // Setup source buffer (NV12, UV plane hstride rows after Y)
         src_buf.width = src_frame->width;
         src_buf.height = src_frame->height;
+        src_buf.wstride = src_frame->linesize[0];
+        src_buf.hstride = hstride;
         src_buf.format = RK_FORMAT_YCbCr_420_SP; // NV12
         src_buf.vir_addr = (void*)src_frame->data[0];
         
-        // Setup destination buffer (BGR)
+        // Setup destination buffer (BGR/RGB)
         dst_buf.width = dst.cols;
         dst_buf.height = dst.rows;
-        dst_buf.format = RK_FORMAT_BGR_888;
+        dst_buf.wstride = dst.cols;
+        dst_buf.hstride = dst.rows;
+        dst_buf.format = out_rga_format;
         dst_buf.vir_addr = (void*)dst.data;
         
-        // Perform conversion
+        // Perform conversion (and scaling)
+        rga_buffer_t pat_buf;
+        memset(&pat_buf, 0, sizeof(pat_buf));
         im_rect src_rect = {0, 0, src_frame->width, src_frame->height};
         im_rect dst_rect = {0, 0, dst.cols, dst.rows};
+        im_rect pat_rect = {0, 0, 0, 0};
         
-        int ret = imcvtcolor(src_buf, dst_buf, src_rect, dst_rect, IM_COLOR_SPACE_DEFAULT);
+        int ret = improcess(src_buf, dst_buf, pat_buf, src_rect, dst_rect, pat_rect, IM_SYNC);
         
         return ret == IM_STATUS_SUCCESS;
     }
@@ -262,13 +355,58 @@ private:
     }
 };
 
+// Hardware resize of an HxWx3 BGR array into a preallocated HxWx3 array using RGA.
+// Used for frames that do not come through RTSPReader (e.g. the VideoCapture
+// fallback in four_view.py). Returns false if RGA rejects the job so the caller
+// can fall back to a software resize.
+bool rga_resize(py::array_t<uint8_t, py::array::c_style> src, py::array_t<uint8_t, py::array::c_style> dst) {
+    if (src.ndim() != 3 || src.shape(2) != 3 || dst.ndim() != 3 || dst.shape(2) != 3) {
+        throw std::runtime_error("rga_resize expects HxWx3 uint8 arrays");
+    }
+
+    rga_buffer_t src_buf, dst_buf;
+    memset(&src_buf, 0, sizeof(src_buf));
+    memset(&dst_buf, 0, sizeof(dst_buf));
+
+    // Setup source buffer (BGR)
+    src_buf.width = static_cast<int>(src.shape(1));
+    src_buf.height = static_cast<int>(src.shape(0));
+    src_buf.wstride = src_buf.width;
+    src_buf.hstride = src_buf.height;
+    src_buf.format = RK_FORMAT_BGR_888;
+    src_buf.vir_addr = (void*)src.data();
+
+    // Setup destination buffer (BGR)
+    dst_buf.width = static_cast<int>(dst.shape(1));
+    dst_buf.height = static_cast<int>(dst.shape(0));
+    dst_buf.wstride = dst_buf.width;
+    dst_buf.hstride = dst_buf.height;
+    dst_buf.format = RK_FORMAT_BGR_888;
+    dst_buf.vir_addr = (void*)dst.mutable_data();
+
+    int ret;
+    {
+        // The blit runs on the RGA unit; let other Python threads proceed
+        py::gil_scoped_release release;
+        ret = imresize(src_buf, dst_buf);
+    }
+
+    return ret == IM_STATUS_SUCCESS;
+}
+
 // Expose to Python
 PYBIND11_MODULE(rtsp_module, m) {
     py::class_<RTSPReader>(m, "RTSPReader")
-        .def(py::init<const std::string&>())
+        .def(py::init<const std::string&, int, int, const std::string&>(),
+             py::arg("url"), py::arg("width") = 0, py::arg("height") = 0, py::arg("pix_fmt") = "bgr24")
         .def("read", &RTSPReader::read)
+        .def("read_into", &RTSPReader::read_into, py::arg("buf").noconvert())
         .def("release", &RTSPReader::release);
 
+    // dst must be written in place, so never let pybind11 substitute a converted copy
+    m.def("rga_resize", &rga_resize, py::arg("src"), py::arg("dst").noconvert(),
+          "Resize a BGR frame into dst using the RGA hardware blitter");
+
     // Expose cv::Mat with buffer protocol for direct NumPy conversion
     py::class_<cv::Mat>(m, "Mat", py::buffer_protocol())
         .def_buffer([](cv::Mat& mat) -> py::buffer_info {
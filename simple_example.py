@@ -4,7 +4,6 @@ Simple RTSP Stream Example
 A basic example showing how to use the rtsp_module.
 """
 
-import numpy as np
 import cv2
 import time
 
@@ -40,11 +39,8 @@ def simple_rtsp_example():
         for i in range(10):  # Capture 10 frames
             print(f"Reading frame {i+1}/10...")
             
-            # Read frame from stream
-            cv_frame = reader.read()
-            
-            # Convert to numpy array (automatic via buffer protocol)
-            frame = np.array(cv_frame, copy=False)
+            # Read frame from stream (returned as a NumPy array)
+            frame = reader.read()
             
             print(f"  Frame shape: {frame.shape}")
             print(f"  Frame dtype: {frame.dtype}")
@@ -81,8 +77,7 @@ def live_stream_viewer():
         
         while True:
             # Read frame
-            cv_frame = reader.read()
-            frame = np.array(cv_frame, copy=False)
+            frame = reader.read()
             
             frame_count += 1
             
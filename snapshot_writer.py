@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Snapshot writer shared by main.py and four_view.py.
+
+Frames are encoded and written by one background thread so a save never
+stalls a display loop. JPEGs are encoded with libjpeg-turbo when PyTurboJPEG
+is installed, otherwise with cv2.imwrite.
+"""
+
+import queue
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# libjpeg-turbo (SIMD) for JPEG snapshots when PyTurboJPEG is installed
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+# Same as cv2.imwrite's default JPEG quality
+JPEG_QUALITY = 95
+
+_save_queue: "queue.Queue" = queue.Queue(maxsize=8)
+_save_thread: Optional[threading.Thread] = None
+_save_thread_lock = threading.Lock()
+
+
+def write_image(frame: np.ndarray, filename: str) -> bool:
+    """
+    Write a BGR (or grayscale) frame to disk synchronously.
+
+    Args:
+        frame (np.ndarray): The frame to write
+        filename (str): Output filename; the extension selects the format
+
+    Returns:
+        bool: True if written successfully, False otherwise
+    """
+    # frame is BGR, which is what cv2.imwrite and TJPF_BGR expect; converting
+    # to RGB first would swap the colours in the saved file
+    if _turbojpeg is not None and frame.ndim == 3 and filename.lower().endswith((".jpg", ".jpeg")):
+        data = _turbojpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR)
+        with open(filename, "wb") as f:
+            f.write(data)
+        return True
+    return cv2.imwrite(filename, frame)
+
+
+def _save_worker():
+    while True:
+        frame, filename = _save_queue.get()
+        try:
+            if write_image(frame, filename):
+                print(f"Saved: {filename}")
+            else:
+                print(f"Failed to save: {filename}")
+        except Exception as e:
+            print(f"Error saving {filename}: {e}")
+        finally:
+            _save_queue.task_done()
+
+
+def save_async(frame: np.ndarray, filename: str) -> bool:
+    """
+    Queue a frame to be written by the background writer thread.
+
+    Args:
+        frame (np.ndarray): The frame to save (copied, so the caller may reuse it)
+        filename (str): Output filename
+
+    Returns:
+        bool: True if queued, False if the queue is full
+    """
+    global _save_thread
+    with _save_thread_lock:
+        if _save_thread is None:
+            _save_thread = threading.Thread(target=_save_worker, daemon=True)
+            _save_thread.start()
+    try:
+        _save_queue.put_nowait((frame.copy(), filename))
+        return True
+    except queue.Full:
+        print(f"Save queue full, dropped: {filename}")
+        return False
+
+
+def flush():
+    """
+    Block until all queued frames have been written.
+    """
+    _save_queue.join()
@@ -9,6 +9,7 @@ import sys
 import os
 import time
 import re
+import shutil
 from pathlib import Path
 
 class Colors:
@@ -72,10 +73,17 @@ def test_kernel_modules():
         'rockchipdrm': 'Rockchip DRM'
     }
     
+    # Read the module list once instead of spawning lsmod | grep per module
+    try:
+        with open('/proc/modules') as f:
+            loaded = f.read().lower()
+    except OSError as e:
+        print_error(f"Cannot read /proc/modules: {e}")
+        return False
+    
     all_passed = True
     for module, description in modules.items():
-        output, _ = run_command(f"lsmod | grep -i {module}")
-        if output:
+        if module.lower() in loaded:
             print_success(f"{description} ({module}) is loaded")
         else:
             print_error(f"{description} ({module}) is NOT loaded")
@@ -134,25 +142,39 @@ def test_ffmpeg_installation():
     print_header("FFmpeg Installation Test")
     
     # Check if ffmpeg exists
-    output, _ = run_command("which ffmpeg")
-    if not output:
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
         print_error("FFmpeg is NOT installed")
         return False
     
-    ffmpeg_path = output.strip()
     print_success(f"FFmpeg found at: {ffmpeg_path}")
     
+    def ffmpeg(*args):
+        # Run ffmpeg directly (no shell) and return its stdout, or "" on failure
+        try:
+            result = subprocess.run(
+                [ffmpeg_path, '-hide_banner', *args],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print_warning(f"ffmpeg {' '.join(args)} failed: {e}")
+            return ""
+        return result.stdout if result.returncode == 0 else ""
+    
     # Check FFmpeg version
-    output, _ = run_command("ffmpeg -version | head -n1")
+    output = ffmpeg('-version')
     if output:
-        print_info(f"Version: {output.strip()}")
+        print_info(f"Version: {output.splitlines()[0].strip()}")
     
-    # Check for rkmpp decoders
-    output, _ = run_command("ffmpeg -hide_banner -decoders 2>/dev/null | grep -i rkmpp")
-    if output:
+    # Check for rkmpp decoders (filtered here rather than through a grep pipeline)
+    output = ffmpeg('-decoders')
+    rkmpp = [line.strip() for line in output.splitlines() if 'rkmpp' in line.lower()]
+    if rkmpp:
         print_success("rkmpp decoders found:")
-        for line in output.strip().split('\n'):
-            print(f"  {line.strip()}")
+        for line in rkmpp:
+            print(f"  {line}")
         return True
     else:
         print_error("rkmpp decoders NOT found")